@@ -17,4 +17,4 @@
 # pylint: disable=unused-import
 
 from acme.adders.base import Adder
-from acme.adders.wrappers import ForkingAdder, IgnoreExtrasAdder
+from acme.adders.wrappers import AsyncAdder, ForkingAdder, IgnoreExtrasAdder
@@ -14,9 +14,12 @@
 
 """A library of useful adder wrappers."""
 
-from typing import Iterable
+import queue
+import threading
+from typing import Any, Callable, Iterable, List
 
 import dm_env
+from absl import logging
 
 from acme import types
 from acme.adders import base
@@ -65,3 +68,91 @@ class IgnoreExtrasAdder(base.Adder):
         extras: types.NestedArray = (),
     ):
         self._adder.add(action, next_timestep)
+
+
+class AsyncAdder(base.Adder):
+    """An adder that forwards data to another adder from a background thread.
+
+  Calls are queued and replayed in order on a daemon thread, which hides the
+  latency of e.g. Reverb inserts from the environment loop. The queue is
+  bounded, so callers block once the wrapped adder falls `max_queue_size` calls
+  behind. The queue is flushed at the end of every episode and on `reset`;
+  call `close` when done with the adder to flush the queue and stop the
+  background thread. Errors raised by the wrapped adder are re-raised on the
+  next call.
+
+  Note that timesteps and actions are only consumed after the caller has moved
+  on, so they must not be modified afterwards, e.g. by environments reusing
+  their observation buffers across steps.
+  """
+
+    def __init__(self, adder: base.Adder, max_queue_size: int = 32):
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size should be >= 1")
+        self._adder = adder
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._errors: List[Exception] = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def _consume(self):
+        """Forwards queued calls to the wrapped adder until `close` is called."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args = item
+                if not self._errors:
+                    fn(*args)
+            except Exception as e:  # pylint: disable=broad-except
+                logging.exception("Error in background thread of %s", self)
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def _raise_if_failed(self):
+        if self._errors:
+            raise RuntimeError(
+                "The wrapped adder failed in the background thread."
+            ) from self._errors[0]
+
+    def _enqueue(self, fn: Callable[..., Any], *args: Any):
+        if self._closed:
+            raise RuntimeError("The adder has been closed.")
+        self._raise_if_failed()
+        self._queue.put((fn, args))
+
+    def flush(self):
+        """Blocks until all queued calls have been forwarded to the wrapped adder."""
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self):
+        """Forwards all queued calls, then stops the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        # Calls are consumed in order, so the thread exits once the queue is empty.
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_if_failed()
+
+    def reset(self):
+        self._enqueue(self._adder.reset)
+        self.flush()
+
+    def add_first(self, timestep: dm_env.TimeStep):
+        self._enqueue(self._adder.add_first, timestep)
+
+    def add(
+        self,
+        action: types.NestedArray,
+        next_timestep: dm_env.TimeStep,
+        extras: types.NestedArray = (),
+    ):
+        self._enqueue(self._adder.add, action, next_timestep, extras)
+        if next_timestep.last():
+            # Make sure the whole episode has been written once it is over.
+            self.flush()
@@ -0,0 +1,102 @@
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for adder wrappers."""
+
+import threading
+
+import dm_env
+from absl.testing import absltest
+
+from acme.adders import base, wrappers
+
+
+class RecordingAdder(base.Adder):
+    """Fake adder which records the calls made to it."""
+
+    def __init__(self, fail_on_add: bool = False):
+        self.calls = []
+        self._fail_on_add = fail_on_add
+
+    def add_first(self, timestep: dm_env.TimeStep):
+        self.calls.append(("add_first", timestep))
+
+    def add(self, action, next_timestep, extras=()):
+        if self._fail_on_add:
+            raise ValueError("Failed to add.")
+        self.calls.append(("add", action))
+
+    def reset(self):
+        self.calls.append(("reset",))
+
+
+class AsyncAdderTest(absltest.TestCase):
+    def test_forwards_calls_in_order(self):
+        adder = RecordingAdder()
+        async_adder = wrappers.AsyncAdder(adder, max_queue_size=2)
+        self.addCleanup(async_adder.close)
+        timestep = dm_env.restart(0)
+        async_adder.add_first(timestep)
+        for action in range(5):
+            async_adder.add(action, dm_env.transition(0.0, 0))
+        async_adder.reset()
+
+        self.assertEqual(
+            adder.calls,
+            [("add_first", timestep)]
+            + [("add", action) for action in range(5)]
+            + [("reset",)],
+        )
+
+    def test_reraises_errors(self):
+        async_adder = wrappers.AsyncAdder(RecordingAdder(fail_on_add=True))
+        async_adder.add_first(dm_env.restart(0))
+        async_adder.add(0, dm_env.transition(0.0, 0))
+        with self.assertRaises(RuntimeError) as context:
+            async_adder.flush()
+        self.assertIsInstance(context.exception.__cause__, ValueError)
+        with self.assertRaises(RuntimeError):
+            async_adder.close()
+
+    def test_flushes_at_episode_end(self):
+        adder = RecordingAdder()
+        async_adder = wrappers.AsyncAdder(adder)
+        self.addCleanup(async_adder.close)
+        async_adder.add_first(dm_env.restart(0))
+        async_adder.add(0, dm_env.transition(0.0, 0))
+        async_adder.add(1, dm_env.termination(0.0, 0))
+        # No explicit flush: the episode is fully written once it has ended.
+        self.assertLen(adder.calls, 3)
+
+    def test_close_flushes_and_stops_thread(self):
+        num_threads = threading.active_count()
+        adder = RecordingAdder()
+        async_adder = wrappers.AsyncAdder(adder)
+        async_adder.add_first(dm_env.restart(0))
+        async_adder.add(0, dm_env.transition(0.0, 0))
+        async_adder.close()
+        self.assertLen(adder.calls, 2)
+        self.assertEqual(threading.active_count(), num_threads)
+        # Closing twice is fine, but the adder can not be used any more.
+        async_adder.close()
+        with self.assertRaises(RuntimeError):
+            async_adder.add(1, dm_env.transition(0.0, 0))
+
+    def test_invalid_queue_size(self):
+        with self.assertRaises(ValueError):
+            wrappers.AsyncAdder(RecordingAdder(), max_queue_size=0)
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -92,6 +92,35 @@ def batched_feed_forward_to_actor_core(
     return ActorCore(init=init, select_action=select_action, get_extras=get_extras)
 
 
+def batched_feed_forward_to_batched_actor_core(
+    policy: FeedForwardPolicy,
+) -> ActorCore[PRNGKey, Tuple[()]]:
+    """Like `batched_feed_forward_to_actor_core`, for batched observations.
+
+  The observations passed to `select_action` must already have a leading batch
+  dimension, e.g. one entry per environment of a `BatchedEnvironmentLoop`, and
+  the returned actions keep it.
+  """
+
+    def select_action(
+        params: networks_lib.Params,
+        observation: networks_lib.Observation,
+        state: PRNGKey,
+    ):
+        rng = state
+        rng1, rng2 = jax.random.split(rng)
+        action = policy(params, rng1, observation)
+        return action, rng2
+
+    def init(rng: PRNGKey) -> PRNGKey:
+        return rng
+
+    def get_extras(unused_rng: PRNGKey) -> Tuple[()]:
+        return ()
+
+    return ActorCore(init=init, select_action=select_action, get_extras=get_extras)
+
+
 @chex.dataclass(frozen=True, mappable_dataclass=False)
 class SimpleActorCoreStateWithExtras:
     rng: PRNGKey
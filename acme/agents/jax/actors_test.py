@@ -22,7 +22,7 @@ import jax.numpy as jnp
 import numpy as np
 from absl.testing import absltest, parameterized
 
-from acme import environment_loop, specs
+from acme import environment_loop, environment_loops, specs
 from acme.agents.jax import actor_core as actor_core_lib
 from acme.agents.jax import actors
 from acme.jax import utils, variable_utils
@@ -81,6 +81,39 @@ class ActorTest(parameterized.TestCase):
         loop = environment_loop.EnvironmentLoop(environment, actor)
         loop.run(20)
 
+    def test_feedforward_batched(self):
+        environments = [_make_fake_env() for _ in range(3)]
+        env_spec = specs.make_environment_spec(environments[0])
+
+        def policy(inputs: jnp.ndarray):
+            action_values = hk.Sequential(
+                [hk.Flatten(), hk.Linear(env_spec.actions.num_values),]
+            )(inputs)
+            return jnp.argmax(action_values, axis=-1)
+
+        policy = hk.without_apply_rng(hk.transform(policy))
+
+        dummy_obs = utils.add_batch_dim(utils.zeros_like(env_spec.observations))
+        params = policy.init(jax.random.PRNGKey(0), dummy_obs)
+
+        def apply_policy(params, key, observations):
+            del key  # Unused for test-case deterministic policy.
+            actions = policy.apply(params, observations)
+            # Actions must keep the batch dimension of the observations.
+            assert actions.shape == (len(environments),)
+            return actions
+
+        variable_source = fakes.VariableSource(params)
+        variable_client = variable_utils.VariableClient(variable_source, "policy")
+        actor = actors.GenericActor(
+            actor_core_lib.batched_feed_forward_to_batched_actor_core(apply_policy),
+            random_key=jax.random.PRNGKey(1),
+            variable_client=variable_client,
+        )
+
+        loop = environment_loops.BatchedEnvironmentLoop(environments, actor)
+        self.assertEqual(loop.run(num_steps=60), 60)
+
 
 def _transform_without_rng(f):
     return hk.without_apply_rng(hk.transform(f))
@@ -14,11 +14,14 @@
 
 """ValueDice agent implementation, using JAX."""
 
-from typing import Callable, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import jax
 import optax
 import reverb
+import tensorflow as tf
+from absl import logging
+from jax.experimental.compilation_cache import compilation_cache
 from reverb import rate_limiters
 
 from acme import adders, core, specs, types
@@ -33,6 +36,43 @@ from acme.jax import networks as networks_lib
 from acme.jax import utils, variable_utils
 from acme.utils import counting, loggers
 
+# Directory the persistent JAX compilation cache was enabled in by this process.
+_compilation_cache_dir: Optional[str] = None
+
+
+def _maybe_initialize_compilation_cache(cache_dir: Optional[str]):
+    """Enables the persistent JAX compilation cache in `cache_dir`.
+
+  This lets actor and learner processes started later reuse the XLA
+  executables compiled by earlier ones instead of compiling them again. Does
+  nothing if `cache_dir` is None or the cache already uses it.
+  """
+    global _compilation_cache_dir
+    if cache_dir is None or cache_dir == _compilation_cache_dir:
+        return
+    _compilation_cache_dir = cache_dir
+    if not hasattr(jax.config, "jax_compilation_cache_dir"):
+        logging.warning(
+            "The installed JAX version does not support configuring the persistent "
+            "compilation cache; ignoring compilation_cache_dir=%s.",
+            cache_dir,
+        )
+        return
+    jax.config.update("jax_compilation_cache_dir", cache_dir)
+    # Policies are small and compile quickly, so cache every executable.
+    for option in (
+        "jax_persistent_cache_min_entry_size_bytes",
+        "jax_persistent_cache_min_compile_time_secs",
+    ):
+        if hasattr(jax.config, option):
+            jax.config.update(option, 0)
+    # JAX decides whether to use the persistent cache on its first compilation,
+    # which may already have happened in this process, e.g. to split random keys.
+    # Where supported, make it decide again.
+    reset_cache = getattr(compilation_cache, "reset_cache", None)
+    if reset_cache is not None:
+        reset_cache()
+
 
 class ValueDiceBuilder(
     builders.ActorLearnerBuilder[
@@ -54,6 +94,14 @@ class ValueDiceBuilder(
     ):
         self._make_demonstrations = make_demonstrations
         self._config = config
+        # Enable the compilation cache as early as possible in the process that
+        # creates the builder. Processes the builder is sent to enable it when
+        # making their actor or learner.
+        _maybe_initialize_compilation_cache(config.compilation_cache_dir)
+        # Replay signatures keyed by the id of the environment spec they were built
+        # from. Specs are neither hashable nor weak-referenceable, so each spec is
+        # kept alive alongside its signature, which also keeps its id unique.
+        self._signatures: Dict[int, Tuple[specs.EnvironmentSpec, Any]] = {}
 
     def make_learner(
         self,
@@ -66,6 +114,7 @@ class ValueDiceBuilder(
         counter: Optional[counting.Counter] = None,
     ) -> core.Learner:
         del environment_spec, replay_client
+        _maybe_initialize_compilation_cache(self._config.compilation_cache_dir)
         iterator_demonstration = self._make_demonstrations(
             self._config.batch_size * self._config.num_sgd_steps_per_step
         )
@@ -110,22 +159,35 @@ class ValueDiceBuilder(
                 remover=reverb.selectors.Fifo(),
                 max_size=self._config.max_replay_size,
                 rate_limiter=limiter,
-                signature=adders_reverb.NStepTransitionAdder.signature(
-                    environment_spec
-                ),
+                signature=self._signature(environment_spec),
             )
         ]
 
+    def _signature(self, environment_spec: specs.EnvironmentSpec) -> Any:
+        """Returns the replay signature for `environment_spec`, computed once."""
+        cached = self._signatures.get(id(environment_spec))
+        if cached is None:
+            signature = adders_reverb.NStepTransitionAdder.signature(environment_spec)
+            cached = (environment_spec, signature)
+            self._signatures[id(environment_spec)] = cached
+        return cached[1]
+
     def make_dataset_iterator(
         self, replay_client: reverb.Client
     ) -> Iterator[reverb.ReplaySample]:
         """Creates a dataset iterator to use for learning."""
+        # Let tf.data size the number of interleaved Reverb readers to the host.
+        # Batching happens per reader, after the interleave is set up.
         dataset = datasets.make_reverb_dataset(
             table=self._config.replay_table_name,
             server_address=replay_client.server_address,
             batch_size=(self._config.batch_size * self._config.num_sgd_steps_per_step),
             prefetch_size=self._config.prefetch_size,
+            num_parallel_calls=tf.data.AUTOTUNE,
         )
+        # Reverb samples live in host memory, where as_numpy_iterator() exposes
+        # them without a copy, so device_put performs the only host-to-device
+        # transfer per batch. Prefetching is left to the experiment runners.
         return utils.device_put(dataset.as_numpy_iterator(), jax.devices()[0])
 
     def make_adder(
@@ -152,10 +214,20 @@ class ValueDiceBuilder(
     ) -> core.Actor:
         del environment_spec
         assert variable_source is not None
+        _maybe_initialize_compilation_cache(self._config.compilation_cache_dir)
         actor_core = actor_core_lib.batched_feed_forward_to_actor_core(policy)
+        if adder is not None and self._config.async_adder_queue_size > 0:
+            # Insert into replay from a background thread, so that the environment
+            # loop does not block on Reverb writes.
+            adder = adders.AsyncAdder(
+                adder, max_queue_size=self._config.async_adder_queue_size
+            )
         # Inference happens on CPU, so it's better to move variables there too.
         variable_client = variable_utils.VariableClient(
-            variable_source, "policy", device="cpu"
+            variable_source,
+            "policy",
+            update_period=self._config.variable_update_period,
+            device="cpu",
         )
         return actors.GenericActor(
             actor_core, random_key, variable_client, adder, backend="cpu"
@@ -0,0 +1,51 @@
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the ValueDice builder."""
+
+import os
+
+import jax
+import jax.numpy as jnp
+from absl.testing import absltest
+from jax.experimental.compilation_cache import compilation_cache
+
+from acme.agents.jax.value_dice import builder
+from acme.testing import test_utils
+
+
+class CompilationCacheTest(test_utils.TestCase):
+    def test_writes_cache_entries(self):
+        if not hasattr(compilation_cache, "reset_cache"):
+            self.skipTest("The cache can not be enabled late with this JAX version.")
+        self.addCleanup(
+            jax.config.update,
+            "jax_compilation_cache_dir",
+            jax.config.jax_compilation_cache_dir,
+        )
+        self.addCleanup(setattr, builder, "_compilation_cache_dir", None)
+
+        # Compile something first, as the random key splits made before actors
+        # and learners are built do.
+        jax.random.split(jax.random.PRNGKey(0))
+
+        cache_dir = self.get_tempdir()
+        builder._maybe_initialize_compilation_cache(cache_dir)
+        # Small and quick to compile, like a policy. Not compiled by other tests.
+        jax.jit(lambda x: x * 3.0 + 1.0)(jnp.ones((7,)))
+        self.assertNotEmpty(os.listdir(cache_dir))
+
+
+if __name__ == "__main__":
+    absltest.main()
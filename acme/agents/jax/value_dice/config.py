@@ -15,6 +15,7 @@
 """ValueDice config."""
 
 import dataclasses
+from typing import Optional
 
 from acme.adders import reverb as adders_reverb
 
@@ -30,6 +31,8 @@ class ValueDiceConfig:
     alpha: float = 0.05
     policy_reg_scale: float = 1e-4
     nu_reg_scale: float = 10.0
+    # Number of actor update() calls between policy variable fetches.
+    variable_update_period: int = 1
 
     # Replay options
     replay_table_name: str = adders_reverb.DEFAULT_PRIORITY_TABLE
@@ -40,6 +43,15 @@ class ValueDiceConfig:
     min_replay_size: int = 1000
     max_replay_size: int = 1000000
     prefetch_size: int = 4
+    # If positive, actors insert transitions into replay from a background
+    # thread, queueing up to this many. Only enable this for environments which
+    # do not reuse their observation buffers across steps. 0 (default) inserts
+    # transitions synchronously.
+    async_adder_queue_size: int = 0
 
     # How many gradient updates to perform per step.
     num_sgd_steps_per_step: int = 1
+
+    # If set, the persistent JAX compilation cache is enabled in this directory
+    # for every executable, so later processes can skip recompilation.
+    compilation_cache_dir: Optional[str] = None
@@ -14,26 +14,30 @@
 
 """A simple agent-environment training loop."""
 
-import operator
 import time
-from typing import List, Optional, Sequence
+from typing import Callable, List, Optional, Sequence
 
 import dm_env
 import numpy as np
 import tree
 from dm_env import specs
 
-from acme import core
+from acme import core, types
 from acme.utils import counting, loggers
 from acme.utils import observers as observers_lib
 from acme.utils import signals
 
+# Initial number of per-step durations to preallocate for each episode.
+_INITIAL_TIMING_CAPACITY = 256
+
 
 class EnvironmentLoop(core.Worker):
     """A simple RL environment loop.
 
   This takes `Environment` and `Actor` instances and coordinates their
-  interaction. Agent is updated if `should_update=True`. This can be used as:
+  interaction. Agent is updated if `should_update=True`, every `update_period`
+  environment steps; the count carries over from one episode to the next. This
+  can be used as:
 
     loop = EnvironmentLoop(environment, actor)
     loop.run(num_episodes)
@@ -51,6 +55,11 @@ class EnvironmentLoop(core.Worker):
   A list of 'Observer' instances can be specified to generate additional metrics
   to be logged by the logger. They have access to the 'Environment' instance,
   the current timestep datastruct and the current action.
+
+  Per-step `select_action` and environment `step` durations are measured with a
+  monotonic clock and reported as episode averages. This bookkeeping is skipped
+  if `enable_step_timing` is False or if the logger is a `NoOpLogger`, in which
+  case the corresponding metrics are NaN.
   """
 
     def __init__(
@@ -62,7 +71,12 @@ class EnvironmentLoop(core.Worker):
         should_update: bool = True,
         label: str = "environment_loop",
         observers: Sequence[observers_lib.EnvLoopObserver] = (),
+        enable_step_timing: bool = True,
+        update_period: int = 1,
     ):
+        if update_period < 1:
+            raise ValueError(f"update_period should be >= 1, got {update_period}.")
+
         # Internalize agent and environment.
         self._environment = environment
         self._actor = actor
@@ -71,7 +85,22 @@ class EnvironmentLoop(core.Worker):
             label, steps_key=self._counter.get_steps_key()
         )
         self._should_update = should_update
-        self._observers = observers
+        self._update_period = update_period
+        self._steps_since_update = 0
+        self._observers = tuple(observers)
+        # Step timings are never looked at if results are not logged.
+        self._enable_step_timing = enable_step_timing and not isinstance(
+            self._logger, loggers.NoOpLogger
+        )
+        reward_spec = environment.reward_spec()
+        self._zero_return_template = tree.map_structure(
+            _generate_zeros_from_spec, reward_spec
+        )
+        # Structured returns are accumulated as a flat list of leaves, which is only
+        # packed back into the structure of the reward spec at the end of episodes.
+        self._structured_return = not isinstance(reward_spec, specs.Array)
+        self._zero_return_leaves = tree.flatten(self._zero_return_template)
+        self._accumulate_reward = _make_reward_accumulator(reward_spec)
 
     def run_episode(self) -> loggers.LoggingData:
         """Run one episode.
@@ -85,58 +114,102 @@ class EnvironmentLoop(core.Worker):
     """
         # Reset any counts and start the environment.
         episode_start_time = time.time()
-        select_action_durations: List[float] = []
-        env_step_durations: List[float] = []
+        step_timing = self._enable_step_timing
+        # Preallocated buffers for per-step durations, grown by doubling.
+        timing_capacity = _INITIAL_TIMING_CAPACITY if step_timing else 0
+        select_action_durations = np.empty(timing_capacity, np.float64)
+        env_step_durations = np.empty(timing_capacity, np.float64)
         episode_steps: int = 0
 
         # For evaluation, this keeps track of the total undiscounted reward
         # accumulated during the episode.
-        episode_return = tree.map_structure(
-            _generate_zeros_from_spec, self._environment.reward_spec()
-        )
-        env_reset_start = time.time()
+        if self._structured_return:
+            episode_return = [np.copy(leaf) for leaf in self._zero_return_leaves]
+        else:
+            episode_return = np.copy(self._zero_return_template)
+        env_reset_start = time.perf_counter()
         timestep = self._environment.reset()
-        env_reset_duration = time.time() - env_reset_start
+        env_reset_duration = time.perf_counter() - env_reset_start
         # Make the first observation.
+        observers = self._observers
         self._actor.observe_first(timestep)
-        for observer in self._observers:
+        for observer in observers:
             # Initialize the observer with the current state of the env after reset
             # and the initial timestep.
             observer.observe_first(self._environment, timestep)
 
+        # Bind attributes used on every step to locals to avoid repeated lookups.
+        environment = self._environment
+        env_step = environment.step
+        select_action = self._actor.select_action
+        observe = self._actor.observe
+        update = self._actor.update
+        should_update = self._should_update
+        update_period = self._update_period
+        steps_since_update = self._steps_since_update
+        structured_return = self._structured_return
+        accumulate_reward = self._accumulate_reward
+        perf_counter = time.perf_counter
+
         # Run an episode.
         while not timestep.last():
+            if step_timing:
+                if episode_steps == select_action_durations.shape[0]:
+                    capacity = 2 * episode_steps
+                    select_action_durations = np.resize(
+                        select_action_durations, capacity
+                    )
+                    env_step_durations = np.resize(env_step_durations, capacity)
+
+                # Generate an action from the agent's policy.
+                select_action_start = perf_counter()
+                action = select_action(timestep.observation)
+                env_step_start = perf_counter()
+                select_action_durations[episode_steps] = (
+                    env_step_start - select_action_start
+                )
+
+                # Step the environment with the agent's selected action.
+                timestep = env_step(action)
+                env_step_durations[episode_steps] = perf_counter() - env_step_start
+            else:
+                action = select_action(timestep.observation)
+                timestep = env_step(action)
+
             # Book-keeping.
             episode_steps += 1
 
-            # Generate an action from the agent's policy.
-            select_action_start = time.time()
-            action = self._actor.select_action(timestep.observation)
-            select_action_durations.append(time.time() - select_action_start)
-
-            # Step the environment with the agent's selected action.
-            env_step_start = time.time()
-            timestep = self._environment.step(action)
-            env_step_durations.append(time.time() - env_step_start)
-
             # Have the agent and observers observe the timestep.
-            self._actor.observe(action, next_timestep=timestep)
-            for observer in self._observers:
-                # One environment step was completed. Observe the current state of the
-                # environment, the current timestep and the action.
-                observer.observe(self._environment, timestep, action)
+            observe(action, next_timestep=timestep)
+            if observers:
+                for observer in observers:
+                    # One environment step was completed. Observe the current state of
+                    # the environment, the current timestep and the action.
+                    observer.observe(environment, timestep, action)
 
             # Give the actor the opportunity to update itself.
-            if self._should_update:
-                self._actor.update()
+            if should_update:
+                steps_since_update += 1
+                if steps_since_update >= update_period:
+                    steps_since_update = 0
+                    update()
 
             # Equivalent to: episode_return += timestep.reward
             # We capture the return value because if timestep.reward is a JAX
             # DeviceArray, episode_return will not be mutated in-place. (In all other
             # cases, the returned episode_return will be the same object as the
-            # argument episode_return.)
-            episode_return = tree.map_structure(
-                operator.iadd, episode_return, timestep.reward
+            # argument episode_return.) Single rewards are added inline, which
+            # rebinds episode_return in the same way.
+            if structured_return:
+                episode_return = accumulate_reward(episode_return, timestep.reward)
+            else:
+                episode_return += timestep.reward
+
+        self._steps_since_update = steps_since_update
+
+        if self._structured_return:
+            episode_return = tree.unflatten_as(
+                self._zero_return_template, episode_return
             )
 
         # Record counts.
@@ -149,14 +222,28 @@ class EnvironmentLoop(core.Worker):
             "episode_return": episode_return,
             "steps_per_second": steps_per_second,
             "env_reset_duration_sec": env_reset_duration,
-            "select_action_duration_sec": np.mean(select_action_durations),
-            "env_step_duration_sec": np.mean(env_step_durations),
+            "select_action_duration_sec": _mean_duration(
+                select_action_durations, episode_steps, step_timing
+            ),
+            "env_step_duration_sec": _mean_duration(
+                env_step_durations, episode_steps, step_timing
+            ),
+            **counts,
         }
-        result.update(counts)
-        for observer in self._observers:
-            result.update(observer.get_metrics())
+        if observers:
+            for observer in observers:
+                result.update(observer.get_metrics())
         return result
 
+    def _run_and_log_episode(self) -> int:
+        """Runs and logs a single episode, returning the number of steps taken."""
+        episode_start = time.time()
+        result = self.run_episode()
+        result = {**result, **{"episode_duration": time.time() - episode_start}}
+        # Log the given episode results.
+        self._logger.write(result)
+        return int(result["episode_length"])
+
     def run(
         self, num_episodes: Optional[int] = None, num_steps: Optional[int] = None,
     ) -> int:
@@ -185,25 +272,74 @@ class EnvironmentLoop(core.Worker):
         if not (num_episodes is None or num_steps is None):
             raise ValueError('Either "num_episodes" or "num_steps" should be None.')
 
-        def should_terminate(episode_count: int, step_count: int) -> bool:
-            return (num_episodes is not None and episode_count >= num_episodes) or (
-                num_steps is not None and step_count >= num_steps
-            )
-
-        episode_count: int = 0
         step_count: int = 0
         with signals.runtime_terminator():
-            while not should_terminate(episode_count, step_count):
-                episode_start = time.time()
-                result = self.run_episode()
-                result = {**result, **{"episode_duration": time.time() - episode_start}}
-                episode_count += 1
-                step_count += int(result["episode_length"])
-                # Log the given episode results.
-                self._logger.write(result)
+            if num_episodes is not None:
+                for _ in range(num_episodes):
+                    step_count += self._run_and_log_episode()
+            elif num_steps is not None:
+                while step_count < num_steps:
+                    step_count += self._run_and_log_episode()
+            else:
+                while True:
+                    step_count += self._run_and_log_episode()
 
         return step_count
 
 
+def _mean_duration(durations: np.ndarray, num_steps: int, enabled: bool) -> float:
+    if not enabled:
+        return float("nan")
+    return durations[:num_steps].mean()
+
+
+_RewardAccumulator = Callable[[List[np.ndarray], types.NestedArray], List[np.ndarray]]
+
+
+def _make_reward_accumulator(
+    reward_spec: types.NestedSpec,
+) -> Optional[_RewardAccumulator]:
+    """Returns a function adding a reward to the flattened return of an episode.
+
+  The structure of the reward spec is fixed for the lifetime of the loop, so
+  we pick the cheapest accumulator once instead of walking the structure with
+  `tree.map_structure` on every step. Returns of structured rewards are kept as
+  a flat list of leaves, see `EnvironmentLoop.run_episode`. Returns None for a
+  single reward array, which the loop accumulates inline.
+  """
+    if isinstance(reward_spec, specs.Array):
+        return None
+    if type(reward_spec) in (list, tuple) and all(
+        isinstance(spec, specs.Array) for spec in reward_spec
+    ):
+        return _flat_iadd
+    return _nested_iadd
+
+
+# Reward types which can be added in-place into numpy accumulators.
+_NUMPY_REWARD_TYPES = (np.ndarray, np.generic, int, float)
+
+
+def _flat_iadd(
+    episode_return: List[np.ndarray], reward: Sequence[np.ndarray]
+) -> List[np.ndarray]:
+    for i, leaf in enumerate(reward):
+        leaf_return = episode_return[i]
+        if isinstance(leaf_return, np.ndarray) and isinstance(
+            leaf, _NUMPY_REWARD_TYPES
+        ):
+            np.add(leaf_return, leaf, out=leaf_return)
+        else:
+            # E.g. JAX DeviceArrays, which can not be accumulated in-place.
+            episode_return[i] = leaf_return + leaf
+    return episode_return
+
+
+def _nested_iadd(
+    episode_return: List[np.ndarray], reward: types.NestedArray
+) -> List[np.ndarray]:
+    return _flat_iadd(episode_return, tree.flatten(reward))
+
+
 def _generate_zeros_from_spec(spec: specs.Array) -> np.ndarray:
     return np.zeros(spec.shape, spec.dtype)
@@ -17,10 +17,13 @@
 from typing import Optional
 
 import numpy as np
+import tree
 from absl.testing import absltest, parameterized
 
 from acme import environment_loop, specs, types
 from acme.testing import fakes
+from acme.utils import loggers
+from acme.utils import observers as observers_lib
 
 EPISODE_LENGTH = 10
 
@@ -42,6 +45,7 @@ TEST_CASES = (
     ("scalar_discount_scalar_reward", None, None),
     ("vector_discount_scalar_reward", F32_2_MIN_0_MAX_1, F32),
     ("matrix_discount_matrix_reward", F32_2x1_MIN_0_MAX_1, F32_1x3),
+    ("vector_discount_tuple_reward", F32_2_MIN_0_MAX_1, (F32, F32_1x3)),
     ("tree_discount_tree_reward", TREE_MIN_0_MAX_1, TREE),
 )
 
@@ -54,7 +58,86 @@ class EnvironmentLoopTest(parameterized.TestCase):
         self.assertIn("episode_length", result)
         self.assertEqual(EPISODE_LENGTH, result["episode_length"])
         self.assertIn("episode_return", result)
+        tree.assert_same_structure(
+            result["episode_return"], reward_spec or specs.Array((), np.float32)
+        )
         self.assertIn("steps_per_second", result)
+        self.assertGreaterEqual(result["select_action_duration_sec"], 0.0)
+        self.assertGreaterEqual(result["env_step_duration_sec"], 0.0)
+
+    @parameterized.named_parameters(
+        ("scalar_reward", F32),
+        ("matrix_reward", F32_1x3),
+        ("tuple_reward", (F32, F32_1x3)),
+        ("tree_reward", TREE),
+    )
+    def test_episode_return(self, reward_spec):
+        environment = _OnesRewardEnvironment(
+            episode_length=EPISODE_LENGTH, reward_spec=reward_spec
+        )
+        actor = fakes.Actor(specs.make_environment_spec(environment))
+        loop = environment_loop.EnvironmentLoop(environment, actor)
+
+        expected_return = tree.map_structure(
+            lambda spec: np.full(spec.shape, EPISODE_LENGTH, spec.dtype), reward_spec
+        )
+        first_return = loop.run_episode()["episode_return"]
+        tree.map_structure(
+            np.testing.assert_array_equal, first_return, expected_return
+        )
+        # The second episode starts from zero, and does not modify the return
+        # reported for the first one.
+        second_return = loop.run_episode()["episode_return"]
+        tree.map_structure(
+            np.testing.assert_array_equal, second_return, expected_return
+        )
+        tree.map_structure(
+            np.testing.assert_array_equal, first_return, expected_return
+        )
+
+    def test_one_episode_without_step_timing(self):
+        _, loop = _parameterized_setup(enable_step_timing=False)
+        result = loop.run_episode()
+        self.assertEqual(EPISODE_LENGTH, result["episode_length"])
+        self.assertTrue(np.isnan(result["select_action_duration_sec"]))
+        self.assertTrue(np.isnan(result["env_step_duration_sec"]))
+
+    def test_no_step_timing_with_noop_logger(self):
+        _, loop = _parameterized_setup(logger=loggers.NoOpLogger())
+        result = loop.run_episode()
+        self.assertTrue(np.isnan(result["select_action_duration_sec"]))
+        self.assertTrue(np.isnan(result["env_step_duration_sec"]))
+
+    def test_step_timing_buffers_grow(self):
+        episode_length = 3 * environment_loop._INITIAL_TIMING_CAPACITY
+        environment = fakes.DiscreteEnvironment(episode_length=episode_length)
+        actor = fakes.Actor(specs.make_environment_spec(environment))
+        loop = environment_loop.EnvironmentLoop(environment, actor)
+        result = loop.run_episode()
+        self.assertEqual(episode_length, result["episode_length"])
+        self.assertGreaterEqual(result["env_step_duration_sec"], 0.0)
+
+    def test_update_period(self):
+        actor, loop = _parameterized_setup(update_period=2)
+        loop.run(num_episodes=3)
+        self.assertEqual(actor.num_updates, 3 * EPISODE_LENGTH // 2)
+
+    def test_update_period_longer_than_episode(self):
+        actor, loop = _parameterized_setup(update_period=16)
+        loop.run(num_episodes=8)
+        # Steps are counted across episodes, so updates still happen even though
+        # no single episode is long enough to reach the update period.
+        self.assertEqual(actor.num_updates, 8 * EPISODE_LENGTH // 16)
+
+    def test_invalid_update_period(self):
+        with self.assertRaises(ValueError):
+            _parameterized_setup(update_period=0)
+
+    def test_one_episode_with_observers(self):
+        observer = _StepCountingObserver()
+        _, loop = _parameterized_setup(observers=[observer])
+        result = loop.run_episode()
+        self.assertEqual(EPISODE_LENGTH, result["num_observed_steps"])
 
     @parameterized.named_parameters(*TEST_CASES)
     def test_run_episodes(self, discount_spec, reward_spec):
@@ -74,15 +157,42 @@ class EnvironmentLoopTest(parameterized.TestCase):
         self.assertEqual(actor.num_updates, 2 * EPISODE_LENGTH)
 
 
+class _OnesRewardEnvironment(fakes.DiscreteEnvironment):
+    """Fake environment which gives a reward of ones on every step."""
+
+    def _generate_fake_reward(self):
+        return tree.map_structure(
+            lambda spec: np.ones(spec.shape, spec.dtype), self.reward_spec()
+        )
+
+
+class _StepCountingObserver(observers_lib.EnvLoopObserver):
+    """Observer counting the number of steps observed in the current episode."""
+
+    def __init__(self):
+        self._num_steps = 0
+
+    def observe_first(self, env, timestep):
+        self._num_steps = 0
+
+    def observe(self, env, timestep, action):
+        self._num_steps += 1
+
+    def get_metrics(self):
+        return {"num_observed_steps": self._num_steps}
+
+
 def _parameterized_setup(
     discount_spec: Optional[types.NestedSpec] = None,
     reward_spec: Optional[types.NestedSpec] = None,
+    **loop_kwargs,
 ):
     """Common setup code that, unlike self.setUp, takes arguments.
 
   Args:
     discount_spec: None, or a (nested) specs.BoundedArray.
     reward_spec: None, or a (nested) specs.Array.
+    **loop_kwargs: Additional keyword arguments passed to the EnvironmentLoop.
   Returns:
     environment, actor, loop
   """
@@ -94,7 +204,7 @@ def _parameterized_setup(
 
     environment = fakes.DiscreteEnvironment(**env_kwargs)
     actor = fakes.Actor(specs.make_environment_spec(environment))
-    loop = environment_loop.EnvironmentLoop(environment, actor)
+    loop = environment_loop.EnvironmentLoop(environment, actor, **loop_kwargs)
     return actor, loop
 
 
@@ -14,6 +14,8 @@
 
 """Specialized environment loops."""
 
+from acme.environment_loops.batched_environment_loop import BatchedEnvironmentLoop
+
 try:
     # pylint: disable=g-import-not-at-top
     from acme.environment_loops.open_spiel_environment_loop import (
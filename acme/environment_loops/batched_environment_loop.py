@@ -0,0 +1,250 @@
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An environment loop stepping several environments with one batched actor."""
+
+import operator
+import time
+from typing import List, Optional, Sequence
+
+import dm_env
+import numpy as np
+import tree
+
+from acme import adders as adders_lib
+from acme import core, environment_loop, specs, types
+from acme.utils import counting, loggers, signals
+
+
+class BatchedEnvironmentLoop(core.Worker):
+    """An RL environment loop acting in several environments at once.
+
+  This takes a sequence of `Environment` instances and a single `Actor` whose
+  `select_action` accepts observations with a leading batch dimension (one
+  entry per environment) and returns actions with the same leading dimension.
+  On every tick the observations of all environments are stacked, a single
+  action selection is made and each environment is stepped with its slice of
+  the batched action. This amortizes the per-call overhead of action selection
+  (e.g. JAX dispatch) over all environments. Environments whose episode ended
+  are reset independently of the others.
+
+  Since a single actor can not observe several independent streams of
+  experience, transitions are instead forwarded to `adders`, which if given
+  must contain one `Adder` per environment; the actor should not write to
+  replay itself. `observe_first` is still called with the batched first
+  timestep, which lets actors such as `GenericActor` initialize their state.
+  JAX actors can be built with
+  `actor_core.batched_feed_forward_to_batched_actor_core`, whose policy sees
+  the batched observations as is. The actor is given the opportunity to
+  update itself once per tick if `should_update=True`.
+
+  Counters and loggers behave as in `EnvironmentLoop`: a result is logged and
+  counts are incremented for every completed episode. This can be used as:
+
+    loop = BatchedEnvironmentLoop(environments, batched_actor)
+    loop.run(num_steps=num_steps)
+  """
+
+    def __init__(
+        self,
+        environments: Sequence[dm_env.Environment],
+        actor: core.Actor,
+        adders: Optional[Sequence[adders_lib.Adder]] = None,
+        counter: Optional[counting.Counter] = None,
+        logger: Optional[loggers.Logger] = None,
+        should_update: bool = True,
+        label: str = "batched_environment_loop",
+    ):
+        if not environments:
+            raise ValueError("At least one environment is required.")
+        if adders is not None and len(adders) != len(environments):
+            raise ValueError(
+                f"Expected one adder per environment, got {len(adders)} adders for "
+                f"{len(environments)} environments."
+            )
+
+        # Internalize agent and environments.
+        self._environments = tuple(environments)
+        self._actor = actor
+        self._adders = tuple(adders) if adders is not None else None
+        self._counter = counter or counting.Counter()
+        self._logger = logger or loggers.make_default_logger(
+            label, steps_key=self._counter.get_steps_key()
+        )
+        self._should_update = should_update
+
+        # All environments share the specs of the first, as their observations are
+        # stacked. Returns are accumulated as in `EnvironmentLoop`.
+        # pylint: disable=protected-access
+        reward_spec = self._environments[0].reward_spec()
+        self._zero_return_template = tree.map_structure(
+            environment_loop._generate_zeros_from_spec, reward_spec
+        )
+        self._structured_return = not isinstance(reward_spec, specs.Array)
+        self._zero_return_leaves = tree.flatten(self._zero_return_template)
+        self._accumulate_reward = environment_loop._make_reward_accumulator(
+            reward_spec
+        )
+        # pylint: enable=protected-access
+
+        # Per-environment state of the episodes in progress, which successive
+        # calls to `run` continue. Set up by the first call to `run`.
+        self._timesteps: Optional[List[dm_env.TimeStep]] = None
+        self._episode_starts: List[float] = []
+        self._episode_lengths: List[int] = []
+        self._episode_returns: List[types.NestedArray] = []
+
+    def _reset(self, index: int) -> dm_env.TimeStep:
+        timestep = self._environments[index].reset()
+        if self._adders is not None:
+            # Drop anything the adder may still hold before starting a new episode.
+            self._adders[index].reset()
+            self._adders[index].add_first(timestep)
+        return timestep
+
+    def run(
+        self, num_episodes: Optional[int] = None, num_steps: Optional[int] = None,
+    ) -> int:
+        """Perform the run loop.
+
+    Run the environment loop either for at least `num_episodes` episodes or for
+    at least `num_steps` steps, summed over all environments. Termination is
+    only checked once all environments have been stepped, so several episodes
+    may complete on the last tick. Episodes still in progress when the loop
+    terminates are continued by the next call to `run`.
+
+    If the number of episodes and the number of steps are not given then this
+    will interact with the environments infinitely.
+
+    Args:
+      num_episodes: minimal number of episodes to run the loop for.
+      num_steps: minimal number of steps to run the loop for.
+
+    Returns:
+      Actual number of steps the loop executed.
+
+    Raises:
+      ValueError: If both 'num_episodes' and 'num_steps' are not None.
+    """
+
+        if not (num_episodes is None or num_steps is None):
+            raise ValueError('Either "num_episodes" or "num_steps" should be None.')
+
+        environments = self._environments
+        adders = self._adders
+        select_action = self._actor.select_action
+        update = self._actor.update
+        should_update = self._should_update
+        structured_return = self._structured_return
+        accumulate_reward = self._accumulate_reward
+
+        if self._timesteps is None:
+            self._start()
+        # These lists are updated in place, so they carry over to the next call.
+        timesteps = self._timesteps
+        episode_starts = self._episode_starts
+        episode_lengths = self._episode_lengths
+        episode_returns = self._episode_returns
+
+        episode_count: int = 0
+        step_count: int = 0
+        with signals.runtime_terminator():
+            while not (
+                (num_episodes is not None and episode_count >= num_episodes)
+                or (num_steps is not None and step_count >= num_steps)
+            ):
+                # Select actions for all environments with a single call.
+                observations = tree.map_structure(
+                    _stack, *[timestep.observation for timestep in timesteps]
+                )
+                actions = select_action(observations)
+
+                for i, environment in enumerate(environments):
+                    action = tree.map_structure(operator.itemgetter(i), actions)
+                    timestep = environment.step(action)
+                    if adders is not None:
+                        adders[i].add(action, timestep)
+
+                    # Book-keeping.
+                    step_count += 1
+                    episode_lengths[i] += 1
+                    if structured_return:
+                        episode_returns[i] = accumulate_reward(
+                            episode_returns[i], timestep.reward
+                        )
+                    else:
+                        episode_returns[i] += timestep.reward
+
+                    if timestep.last():
+                        self._log_episode(
+                            episode_lengths[i], episode_returns[i], episode_starts[i]
+                        )
+                        episode_count += 1
+                        episode_starts[i] = time.time()
+                        episode_lengths[i] = 0
+                        episode_returns[i] = self._zero_return()
+                        timestep = self._reset(i)
+
+                    timesteps[i] = timestep
+
+                # Give the actor the opportunity to update itself.
+                if should_update:
+                    update()
+
+        return step_count
+
+    def _start(self):
+        """Starts the first episode of every environment."""
+        self._timesteps = [self._reset(i) for i in range(len(self._environments))]
+        self._episode_starts = [time.time()] * len(self._environments)
+        self._episode_lengths = [0] * len(self._environments)
+        self._episode_returns = [
+            self._zero_return() for _ in range(len(self._environments))
+        ]
+        # Let the actor initialize its state, e.g. the random key of a
+        # `GenericActor`.
+        self._actor.observe_first(
+            dm_env.restart(
+                tree.map_structure(
+                    _stack, *[timestep.observation for timestep in self._timesteps]
+                )
+            )
+        )
+
+    def _zero_return(self) -> types.NestedArray:
+        if self._structured_return:
+            return [np.copy(leaf) for leaf in self._zero_return_leaves]
+        return np.copy(self._zero_return_template)
+
+    def _log_episode(
+        self, episode_length: int, episode_return: types.NestedArray, start: float
+    ):
+        if self._structured_return:
+            episode_return = tree.unflatten_as(
+                self._zero_return_template, episode_return
+            )
+        counts = self._counter.increment(episodes=1, steps=episode_length)
+        episode_duration = time.time() - start
+        result = {
+            "episode_length": episode_length,
+            "episode_return": episode_return,
+            "episode_duration": episode_duration,
+            "steps_per_second": episode_length / episode_duration,
+        }
+        result.update(counts)
+        self._logger.write(result)
+
+
+def _stack(*values: types.NestedArray) -> np.ndarray:
+    return np.stack(values)
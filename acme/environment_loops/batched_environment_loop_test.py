@@ -0,0 +1,179 @@
+# Copyright 2018 DeepMind Technologies Limited. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the batched environment loop."""
+
+import dm_env
+import numpy as np
+import tree
+from absl.testing import absltest, parameterized
+
+from acme import adders, core, specs, types
+from acme.environment_loops import batched_environment_loop
+from acme.testing import fakes
+from acme.utils import counting, loggers
+
+EPISODE_LENGTH = 10
+NUM_ENVIRONMENTS = 3
+
+F32 = specs.Array((), np.float32)
+F32_1x3 = specs.Array((1, 3), np.float32)
+
+
+class BatchedActor(core.Actor):
+    """Fake actor which selects one zero action per batch entry."""
+
+    def __init__(self, spec: specs.EnvironmentSpec):
+        self._spec = spec
+        self.num_select_action_calls = 0
+        self.num_updates = 0
+
+    def select_action(self, observation: types.NestedArray) -> types.NestedArray:
+        self.num_select_action_calls += 1
+        batch_size = observation.shape[0]
+        self._spec.observations.validate(observation[0])
+        return np.zeros(
+            (batch_size,) + self._spec.actions.shape, self._spec.actions.dtype
+        )
+
+    def observe_first(self, timestep: dm_env.TimeStep):
+        pass
+
+    def observe(self, action: types.NestedArray, next_timestep: dm_env.TimeStep):
+        pass
+
+    def update(self, wait: bool = False):
+        self.num_updates += 1
+
+
+class CountingAdder(adders.Adder):
+    """Fake adder which counts the calls made to it."""
+
+    def __init__(self):
+        self.num_add_first = 0
+        self.num_add = 0
+        self.num_reset = 0
+
+    def add_first(self, timestep: dm_env.TimeStep):
+        self.num_add_first += 1
+
+    def add(self, action, next_timestep, extras=()):
+        self.num_add += 1
+
+    def reset(self):
+        self.num_reset += 1
+
+
+class OnesRewardEnvironment(fakes.DiscreteEnvironment):
+    """Fake environment which gives a reward of ones on every step."""
+
+    def _generate_fake_reward(self):
+        return tree.map_structure(
+            lambda spec: np.ones(spec.shape, spec.dtype), self.reward_spec()
+        )
+
+
+class BatchedEnvironmentLoopTest(parameterized.TestCase):
+    def setUp(self):
+        super().setUp()
+        self._environments = [
+            fakes.DiscreteEnvironment(episode_length=EPISODE_LENGTH)
+            for _ in range(NUM_ENVIRONMENTS)
+        ]
+        self._actor = BatchedActor(
+            specs.make_environment_spec(self._environments[0])
+        )
+
+    def test_run_steps(self):
+        loop = batched_environment_loop.BatchedEnvironmentLoop(
+            self._environments, self._actor
+        )
+        num_steps = loop.run(num_steps=2 * NUM_ENVIRONMENTS * EPISODE_LENGTH)
+        self.assertEqual(num_steps, 2 * NUM_ENVIRONMENTS * EPISODE_LENGTH)
+        # A single action selection is made for all environments per tick.
+        self.assertEqual(self._actor.num_select_action_calls, 2 * EPISODE_LENGTH)
+        self.assertEqual(self._actor.num_updates, 2 * EPISODE_LENGTH)
+
+    def test_run_episodes(self):
+        loop = batched_environment_loop.BatchedEnvironmentLoop(
+            self._environments, self._actor
+        )
+        loop.run(num_episodes=NUM_ENVIRONMENTS)
+        self.assertEqual(self._actor.num_select_action_calls, EPISODE_LENGTH)
+
+    def test_adders_receive_transitions(self):
+        loop_adders = [CountingAdder() for _ in range(NUM_ENVIRONMENTS)]
+        loop = batched_environment_loop.BatchedEnvironmentLoop(
+            self._environments, self._actor, adders=loop_adders
+        )
+        loop.run(num_episodes=NUM_ENVIRONMENTS)
+        for adder in loop_adders:
+            self.assertEqual(adder.num_add, EPISODE_LENGTH)
+            # Each environment is reset again after its episode completes.
+            self.assertEqual(adder.num_add_first, 2)
+
+    def test_episodes_continue_between_runs(self):
+        counter = counting.Counter()
+        loop_adders = [CountingAdder() for _ in range(NUM_ENVIRONMENTS)]
+        loop = batched_environment_loop.BatchedEnvironmentLoop(
+            self._environments, self._actor, adders=loop_adders, counter=counter
+        )
+        # Each run stops in the middle of the first episode of each environment,
+        # which the second run picks up where the first left off.
+        loop.run(num_steps=NUM_ENVIRONMENTS * EPISODE_LENGTH // 2)
+        loop.run(num_steps=NUM_ENVIRONMENTS * EPISODE_LENGTH // 2)
+        for adder in loop_adders:
+            self.assertEqual(adder.num_add, EPISODE_LENGTH)
+            # One episode completed, after which the environment was reset again.
+            self.assertEqual(adder.num_add_first, 2)
+        counts = counter.get_counts()
+        self.assertEqual(counts["episodes"], NUM_ENVIRONMENTS)
+        self.assertEqual(counts["steps"], NUM_ENVIRONMENTS * EPISODE_LENGTH)
+
+    @parameterized.named_parameters(
+        ("scalar", F32),
+        ("tuple", (F32, F32_1x3)),
+        ("tree", {"a": F32, "b": [F32_1x3, F32]}),
+    )
+    def test_episode_return(self, reward_spec):
+        environments = [
+            OnesRewardEnvironment(episode_length=EPISODE_LENGTH, reward_spec=reward_spec)
+            for _ in range(NUM_ENVIRONMENTS)
+        ]
+        logger = loggers.InMemoryLogger()
+        loop = batched_environment_loop.BatchedEnvironmentLoop(
+            environments, self._actor, logger=logger
+        )
+        # Two episodes per environment, so returns must not carry over.
+        loop.run(num_episodes=2 * NUM_ENVIRONMENTS)
+        self.assertLen(logger.data, 2 * NUM_ENVIRONMENTS)
+        for result in logger.data:
+            tree.assert_same_structure(result["episode_return"], reward_spec)
+            tree.map_structure(
+                lambda spec, value: np.testing.assert_array_equal(
+                    value, np.full(spec.shape, EPISODE_LENGTH, spec.dtype)
+                ),
+                reward_spec,
+                result["episode_return"],
+            )
+
+    def test_wrong_number_of_adders_raises(self):
+        with self.assertRaises(ValueError):
+            batched_environment_loop.BatchedEnvironmentLoop(
+                self._environments, self._actor, adders=[CountingAdder()]
+            )
+
+
+if __name__ == "__main__":
+    absltest.main()
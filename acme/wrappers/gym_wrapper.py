@@ -36,6 +36,8 @@ class GymWrapper(dm_env.Environment):
         self._environment = environment
         self._reset_next_step = True
         self._last_info = None
+        # Reward spec used to convert rewards, built lazily on the first step.
+        self._reward_spec = None
 
         # Convert action and observation specs.
         obs_space = self._environment.observation_space
@@ -61,14 +63,14 @@ class GymWrapper(dm_env.Environment):
         self._last_info = info
 
         # Convert the type of the reward based on the spec, respecting the scalar or
-        # array property.
-        reward = tree.map_structure(
-            lambda x, t: (  # pylint: disable=g-long-lambda
-                t.dtype.type(x) if np.isscalar(x) else np.asarray(x, dtype=t.dtype)
-            ),
-            reward,
-            self.reward_spec(),
-        )
+        # array property. The spec is fixed, so only build it once and skip the
+        # structure traversal for the common case of a single reward array.
+        if self._reward_spec is None:
+            self._reward_spec = self.reward_spec()
+        if isinstance(self._reward_spec, specs.Array):
+            reward = _convert_reward(reward, self._reward_spec)
+        else:
+            reward = tree.map_structure(_convert_reward, reward, self._reward_spec)
 
         if done:
             truncated = info.get("TimeLimit.truncated", False)
@@ -107,6 +109,12 @@ class GymWrapper(dm_env.Environment):
         self._environment.close()
 
 
+def _convert_reward(reward: types.NestedArray, spec: specs.Array) -> types.NestedArray:
+    if np.isscalar(reward):
+        return spec.dtype.type(reward)
+    return np.asarray(reward, dtype=spec.dtype)
+
+
 def _convert_to_spec(space: gym.Space, name: Optional[str] = None) -> types.NestedSpec:
     """Converts an OpenAI Gym space to a dm_env spec or nested structure of specs.
 
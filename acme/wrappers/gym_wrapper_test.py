@@ -98,6 +98,43 @@ class GymWrapperTest(absltest.TestCase):
         self.assertTrue(np.isscalar(ts.reward))
         env.close()
 
+    def test_scalar_reward_spec_is_built_once(self):
+        class CountingGymWrapper(gym_wrapper.GymWrapper):
+            num_reward_spec_calls = 0
+
+            def reward_spec(self):
+                self.num_reward_spec_calls += 1
+                return super().reward_spec()
+
+        env = CountingGymWrapper(_make_constant_reward_env(0.5))
+        env.reset()
+        for _ in range(3):
+            timestep = env.step(0)
+            self.assertTrue(np.isscalar(timestep.reward))
+            self.assertEqual(timestep.reward.dtype, np.float64)
+            self.assertEqual(timestep.reward, 0.5)
+        self.assertEqual(env.num_reward_spec_calls, 1)
+
+    def test_structured_reward(self):
+        class StructuredRewardGymWrapper(gym_wrapper.GymWrapper):
+            def reward_spec(self):
+                return {
+                    "a": specs.Array((), np.float32),
+                    "b": specs.Array((2,), np.float32),
+                }
+
+        env = StructuredRewardGymWrapper(
+            _make_constant_reward_env({"a": 1.0, "b": [1.0, 2.0]})
+        )
+        env.reset()
+        timestep = env.step(0)
+        self.assertTrue(np.isscalar(timestep.reward["a"]))
+        self.assertEqual(timestep.reward["a"].dtype, np.float32)
+        self.assertEqual(timestep.reward["a"], 1.0)
+        self.assertIsInstance(timestep.reward["b"], np.ndarray)
+        self.assertEqual(timestep.reward["b"].dtype, np.float32)
+        np.testing.assert_array_equal(timestep.reward["b"], [1.0, 2.0])
+
     def test_multi_discrete(self):
         space = gym.spaces.MultiDiscrete([2, 3])
         spec = gym_wrapper._convert_to_spec(space)
@@ -109,6 +146,22 @@ class GymWrapperTest(absltest.TestCase):
         self.assertRaises(ValueError, spec.validate, [1, 3])
 
 
+def _make_constant_reward_env(reward):
+    """Returns a gym environment which always gives the same reward."""
+
+    class ConstantRewardEnv(gym.Env):
+        observation_space = gym.spaces.Box(-1.0, 1.0, (1,), np.float32)
+        action_space = gym.spaces.Discrete(2)
+
+        def reset(self):
+            return np.zeros((1,), np.float32)
+
+        def step(self, action):
+            return np.zeros((1,), np.float32), reward, False, {}
+
+    return ConstantRewardEnv()
+
+
 @unittest.skipIf(SKIP_ATARI_TESTS, SKIP_ATARI_MESSAGE)
 class AtariGymWrapperTest(absltest.TestCase):
     def test_pong(self):